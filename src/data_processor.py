@@ -2,20 +2,56 @@
 Data Processor - Process and analyze EXIF data
 """
 import pandas as pd
-from typing import List, Dict
+from functools import partial
+from typing import Callable, List, Dict, Union
+
+
+# Repetitive text columns stored as categories
+CATEGORY_COLUMNS = ('camera_make', 'camera_model', 'lens', 'orientation')
+
+# Whole-number columns downcast to the smallest unsigned integer type
+UNSIGNED_COLUMNS = ('iso', 'width', 'height')
+
+
+def build_frame(photos_data: List[Dict]) -> pd.DataFrame:
+    """
+    Build a single columnar DataFrame from extracted EXIF records
+    
+    Args:
+        photos_data: List of dictionaries containing EXIF data
+    """
+    df = pd.DataFrame.from_records(photos_data)
+    
+    if 'datetime' in df.columns:
+        df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce')
+    
+    # Shrink columns so value_counts/groupby touch less memory
+    # (columns with gaps stay float64, as NaN has no integer form)
+    for column in UNSIGNED_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce', downcast='unsigned')
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    
+    return df
 
 
 class DataProcessor:
     """Process EXIF data for analysis and visualization"""
     
-    def __init__(self, photos_data: List[Dict]):
+    def __init__(self, photos_data: Union[pd.DataFrame, List[Dict]]):
         """
         Initialize with extracted EXIF data
         
         Args:
-            photos_data: List of dictionaries containing EXIF data
+            photos_data: DataFrame from build_frame, or a list of
+                dictionaries containing EXIF data
         """
-        self.df = pd.DataFrame(photos_data)
+        if isinstance(photos_data, pd.DataFrame):
+            self.df = photos_data.copy(deep=False)
+        else:
+            self.df = build_frame(photos_data)
         self.process_data()
     
     def process_data(self):
@@ -25,12 +61,15 @@ class DataProcessor:
         
         # Process datetime data
         if 'datetime' in self.df.columns:
-            self.df['date'] = pd.to_datetime(self.df['datetime'])
+            self.df['date'] = pd.to_datetime(self.df['datetime'], errors='coerce')
             self.df['year'] = self.df['date'].dt.year
             self.df['month'] = self.df['date'].dt.month
             self.df['day_of_week'] = self.df['date'].dt.day_name()
             self.df['hour'] = self.df['date'].dt.hour
-            self.df['time_of_day'] = self.df['hour'].apply(self._categorize_time_of_day)
+            
+            # Map hours through a 24-entry lookup instead of a per-row apply
+            hour_lookup = {hour: self._categorize_time_of_day(hour) for hour in range(24)}
+            self.df['time_of_day'] = self.df['hour'].map(hour_lookup).fillna('Unknown')
     
     def _categorize_time_of_day(self, hour):
         """Categorize hour into time of day periods"""
@@ -106,12 +145,12 @@ class DataProcessor:
             'Count': fl_counts.values
         })
     
-    def get_shooting_timeline(self, freq='M') -> pd.DataFrame:
+    def get_shooting_timeline(self, freq='ME') -> pd.DataFrame:
         """
         Get photo count over time
         
         Args:
-            freq: Frequency ('D'=day, 'W'=week, 'M'=month, 'Y'=year)
+            freq: Frequency ('D'=day, 'W'=week, 'ME'=month, 'YE'=year)
         """
         if 'date' not in self.df.columns:
             return pd.DataFrame()
@@ -222,4 +261,29 @@ class DataProcessor:
                 'most_common': float(self.df['focal_length'].mode()[0]) if len(self.df['focal_length'].mode()) > 0 else None
             }
         
-        return report
\ No newline at end of file
+        return report
+    
+    def aggregations(self, freq='ME') -> Dict[str, Callable]:
+        """
+        Map each dashboard aggregation to the call that computes it
+        
+        Args:
+            freq: Timeline frequency (see get_shooting_timeline)
+            
+        Returns:
+            Dictionary mapping section name to a zero-argument callable
+        """
+        return {
+            'summary': self.get_summary_report,
+            'camera': self.get_camera_usage,
+            'lens': self.get_lens_usage,
+            'iso': self.get_iso_distribution,
+            'aperture': self.get_aperture_distribution,
+            'focal_length': self.get_focal_length_distribution,
+            'timeline': partial(self.get_shooting_timeline, freq=freq),
+            'time_of_day': self.get_time_of_day_distribution,
+            'day_of_week': self.get_day_of_week_distribution,
+            'orientation': self.get_orientation_stats,
+            'flash': self.get_flash_usage_stats,
+            'gps': self.get_gps_photos,
+        }
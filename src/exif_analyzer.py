@@ -1,12 +1,25 @@
 """
 EXIF Analyzer - Extract metadata from photos
 """
+import hashlib
+import io
+import os
+from collections.abc import Sized
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
 from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
+from PIL.ExifTags import Base, GPS, GPSTAGS, IFD
 from datetime import datetime
 from tqdm import tqdm
 
+from jpeg_exif import JpegExifError, read_jpeg_exif
+
+
+# Returned by workers when a JPEG header was too short to parse on its own
+FULL_READ_NEEDED = 'full_read_needed'
+
 
 class ExifAnalyzer:
     """Extract and analyze EXIF data from photos"""
@@ -14,16 +27,51 @@ class ExifAnalyzer:
     # Supported image formats
     SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.tiff', '.tif'}
     
-    def __init__(self):
+    # Formats whose EXIF can be parsed from a header alone
+    HEADER_FORMATS = {'.jpg', '.jpeg'}
+    
+    # Tags the dashboard uses, from the base IFD and the Exif sub-IFD
+    BASE_IFD_TAGS = (Base.Make, Base.Model, Base.DateTime)
+    EXIF_IFD_TAGS = (
+        Base.LensModel, Base.FocalLength, Base.FNumber, Base.ExposureTime,
+        Base.ISOSpeedRatings, Base.DateTimeOriginal, Base.Flash,
+    )
+    GPS_IFD_TAGS = (GPS.GPSLatitudeRef, GPS.GPSLatitude, GPS.GPSLongitudeRef, GPS.GPSLongitude)
+    
+    # Bytes read per JPEG in fast_read mode (EXIF lives in the first APP1 segment)
+    HEADER_BYTES = 80_000
+    
+    # Leading bytes hashed (with the file size) to spot duplicate photos in
+    # ZIP and upload scans
+    FINGERPRINT_BYTES = 65_536
+    
+    # Scans with fewer known jobs run in-process: starting workers costs more
+    # than parsing a handful of headers
+    MIN_POOL_JOBS = 64
+    
+    def __init__(self, max_workers=None, fast_read=True, fast_parse=True):
+        """
+        Args:
+            max_workers: Number of worker processes used for scanning
+                (defaults to the CPU count, 1 scans in-process)
+            fast_read: Parse JPEGs from their first HEADER_BYTES only,
+                re-reading the full file if the header is truncated
+            fast_parse: Read JPEG EXIF with the built-in APP1 parser,
+                falling back to Pillow if it cannot handle a file
+        """
         self.photos_data = []
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.fast_read = fast_read
+        self.fast_parse = fast_parse
     
-    def scan_folder(self, folder_path, recursive=True):
+    def scan_folder(self, folder_path, recursive=True, progress_callback=None):
         """
         Scan folder for photos and extract EXIF data
         
         Args:
             folder_path: Path to folder containing photos
             recursive: Whether to scan subfolders
+            progress_callback: Optional callable receiving (done, total)
             
         Returns:
             List of dictionaries containing EXIF data
@@ -32,23 +80,196 @@ class ExifAnalyzer:
         if not folder.exists():
             raise ValueError(f"Folder not found: {folder_path}")
         
-        # Find all image files
-        if recursive:
-            image_files = [f for f in folder.rglob('*') if f.suffix.lower() in self.SUPPORTED_FORMATS]
-        else:
-            image_files = [f for f in folder.glob('*') if f.suffix.lower() in self.SUPPORTED_FORMATS]
+        jobs = (
+            (str(img_path), self.fast_read, self.fast_parse)
+            for img_path in self._iter_images(folder, recursive)
+        )
         
-        print(f"Found {len(image_files)} photos to analyze...")
+        # Extract EXIF from each file as the folder walk finds it
+        results = self._run_jobs(_extract_one, jobs, progress_callback)
+        self.photos_data = [exif_data for exif_data in results if exif_data]
         
-        # Extract EXIF from each file
-        self.photos_data = []
-        for img_path in tqdm(image_files, desc="Extracting EXIF data"):
-            exif_data = self.extract_exif(img_path)
-            if exif_data:
-                self.photos_data.append(exif_data)
+        return self.photos_data
+    
+    def _iter_images(self, folder, recursive=True):
+        """Lazily yield supported, non-hidden image files in a folder"""
+        candidates = folder.rglob('*') if recursive else folder.glob('*')
+        for path in candidates:
+            if path.suffix.lower() in self.SUPPORTED_FORMATS and not path.name.startswith('.'):
+                yield path
+    
+    def scan_zip(self, zip_file, progress_callback=None):
+        """
+        Scan a ZIP archive for photos and extract EXIF data
+        
+        Members are read straight from the archive, so nothing is
+        extracted to disk. Directories and macOS resource forks are skipped.
+        
+        Args:
+            zip_file: Open zipfile.ZipFile containing photos
+            progress_callback: Optional callable receiving (done, total)
+            
+        Returns:
+            List of dictionaries containing EXIF data
+        """
+        streams = [
+            (info.filename, info.file_size, partial(zip_file.open, info))
+            for info in zip_file.infolist() if self._is_zip_photo(info)
+        ]
+        return self._scan_streams(streams, progress_callback)
+    
+    def scan_buffers(self, buffers, progress_callback=None):
+        """
+        Scan in-memory photos (e.g. uploaded files) and extract EXIF data
+        
+        Args:
+            buffers: Iterable of (name, seekable binary file object) pairs
+            progress_callback: Optional callable receiving (done, total)
+            
+        Returns:
+            List of dictionaries containing EXIF data
+        """
+        streams = [
+            (name, self._buffer_size(fileobj), partial(_rewound, fileobj))
+            for name, fileobj in buffers if Path(name).suffix.lower() in self.SUPPORTED_FORMATS
+        ]
+        return self._scan_streams(streams, progress_callback)
+    
+    def _scan_streams(self, streams, progress_callback=None):
+        """
+        Extract EXIF data from a list of readable streams
+        
+        Args:
+            streams: List of (name, file_size, open_stream) tuples, where
+                open_stream returns a context manager yielding the file object
+            progress_callback: Optional callable receiving (done, total)
+            
+        Returns:
+            List of dictionaries containing EXIF data
+        """
+        # Read each stream (or its header) here and parse the bytes in workers,
+        # sending identical photos through only once
+        jobs = []
+        job_streams = []
+        first_seen = {}
+        duplicates = []
+        for name, file_size, open_stream in streams:
+            with open_stream() as stream:
+                data = self._read_stream(stream, name, file_size)
+            
+            key = self._fingerprint(data, file_size)
+            if key in first_seen:
+                duplicates.append((first_seen[key], Path(name).name, name))
+                continue
+            first_seen[key] = len(jobs)
+            jobs.append((name, data, file_size, self.fast_parse))
+            job_streams.append((name, file_size, open_stream))
+        results = self._run_jobs(_extract_bytes, jobs, progress_callback)
+        
+        # Headers that were too short for the fast path get a full read
+        for index, (name, file_size, open_stream) in enumerate(job_streams):
+            if results[index] == FULL_READ_NEEDED:
+                with open_stream() as stream:
+                    results[index] = self.analyze_stream(stream, name, file_size=file_size)
+        
+        self.photos_data = self._collect_results(results, duplicates)
         
         return self.photos_data
     
+    def _fingerprint(self, data, file_size):
+        """Identify likely-identical photos by their size and leading bytes"""
+        digest = hashlib.blake2b(data[:self.FINGERPRINT_BYTES], digest_size=16).digest()
+        return digest, file_size
+    
+    def _collect_results(self, results, duplicates):
+        """
+        Drop failed results and add a record for each duplicate photo
+        
+        Args:
+            results: Raw job results, in job order
+            duplicates: List of (job index, filename, filepath) for photos
+                that matched an earlier job's fingerprint
+            
+        Returns:
+            List of dictionaries containing EXIF data
+        """
+        photos_data = [exif_data for exif_data in results if exif_data]
+        for index, filename, filepath in duplicates:
+            if results[index]:
+                photos_data.append({**results[index], 'filename': filename, 'filepath': filepath})
+        return photos_data
+    
+    def _read_stream(self, stream, name, file_size):
+        """Read a stream, or just a JPEG's header in fast_read mode"""
+        if self.fast_read and file_size > self.HEADER_BYTES and self._has_header_format(name):
+            return stream.read(self.HEADER_BYTES)
+        return stream.read()
+    
+    def _has_header_format(self, name):
+        """Check whether a file name is one of the HEADER_FORMATS"""
+        return Path(name).suffix.lower() in self.HEADER_FORMATS
+    
+    def _buffer_size(self, fileobj):
+        """Get the size in bytes of a seekable file object"""
+        size = getattr(fileobj, 'size', None)
+        if size is None:
+            size = fileobj.seek(0, io.SEEK_END)
+        return size
+    
+    def _run_jobs(self, func, jobs, progress_callback=None):
+        """
+        Run extraction jobs, fanning out over a process pool
+        
+        Args:
+            func: Module-level extraction function (must be picklable)
+            jobs: Iterable of argument tuples for func (consumed lazily when
+                running in the pool, so workers start before it is exhausted);
+                a sized collection also caps the pool at one worker per job
+            progress_callback: Optional callable receiving (done, total)
+            
+        Returns:
+            List of raw job results, in job order
+        """
+        max_workers = self.max_workers
+        if isinstance(jobs, Sized):
+            max_workers = min(max_workers, len(jobs)) if len(jobs) >= self.MIN_POOL_JOBS else 1
+        
+        if max_workers <= 1:
+            jobs = list(jobs)
+            total = len(jobs)
+            print(f"Found {total} photos to analyze...")
+            
+            results = [None] * total
+            for index, args in enumerate(tqdm(jobs, desc="Extracting EXIF data")):
+                results[index] = func(*args)
+                if progress_callback:
+                    progress_callback(index + 1, total)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(func, *args): index for index, args in enumerate(jobs)}
+                total = len(futures)
+                print(f"Found {total} photos to analyze...")
+                
+                results = [None] * total
+                completed = tqdm(as_completed(futures), total=total, desc="Extracting EXIF data")
+                for done, future in enumerate(completed, start=1):
+                    results[futures[future]] = future.result()
+                    if progress_callback:
+                        progress_callback(done, total)
+        
+        return results
+    
+    def _is_zip_photo(self, info):
+        """Check whether a ZIP member is a supported photo worth scanning"""
+        if info.is_dir():
+            return False
+        
+        member_path = Path(info.filename)
+        if '__MACOSX' in member_path.parts or member_path.name.startswith('._'):
+            return False
+        
+        return member_path.suffix.lower() in self.SUPPORTED_FORMATS
+    
     def extract_exif(self, image_path):
         """
         Extract EXIF data from a single image
@@ -60,56 +281,192 @@ class ExifAnalyzer:
             Dictionary with extracted EXIF data or None
         """
         try:
-            image = Image.open(image_path)
-            exif_data = image._getexif()
+            file_size = image_path.stat().st_size
             
-            if not exif_data:
-                return None
+            if (self.fast_read or self.fast_parse) and self._has_header_format(image_path.name):
+                with open(image_path, 'rb') as f:
+                    header = f.read(self.HEADER_BYTES) if self.fast_read else f.read()
+                parsed, exif_data = self._parse_header(header, image_path.name, str(image_path), file_size)
+                if parsed:
+                    return exif_data
             
-            # Initialize parsed data
-            parsed_data = {
-                'filename': image_path.name,
-                'filepath': str(image_path),
-                'file_size': image_path.stat().st_size / (1024 * 1024),  # MB
-            }
-            
-            # Extract key metadata
-            for tag_id, value in exif_data.items():
-                tag_name = TAGS.get(tag_id, tag_id)
-                
-                if tag_name == "Make":
-                    parsed_data['camera_make'] = str(value).strip()
-                elif tag_name == "Model":
-                    parsed_data['camera_model'] = str(value).strip()
-                elif tag_name == "LensModel":
-                    parsed_data['lens'] = str(value).strip()
-                elif tag_name == "FocalLength":
-                    parsed_data['focal_length'] = self._parse_rational(value)
-                elif tag_name == "FNumber":
-                    parsed_data['aperture'] = self._parse_rational(value)
-                elif tag_name == "ExposureTime":
-                    parsed_data['shutter_speed'] = self._parse_shutter_speed(value)
-                elif tag_name == "ISOSpeedRatings":
-                    parsed_data['iso'] = int(value)
-                elif tag_name in ["DateTime", "DateTimeOriginal"]:
-                    parsed_data['datetime'] = self._parse_datetime(value)
-                elif tag_name == "Flash":
-                    parsed_data['flash_used'] = bool(value & 1)
-                elif tag_name == "GPSInfo":
-                    gps_data = self._parse_gps(value)
-                    if gps_data:
-                        parsed_data.update(gps_data)
-            
-            # Add image dimensions and orientation
-            parsed_data['width'], parsed_data['height'] = image.size
-            parsed_data['orientation'] = 'portrait' if image.size[1] > image.size[0] else 'landscape'
-            
-            return parsed_data
+            image = Image.open(image_path)
+            return self._parse_image(
+                image,
+                filename=image_path.name,
+                filepath=str(image_path),
+                file_size=file_size,
+            )
             
         except Exception as e:
             print(f"Error processing {image_path.name}: {str(e)}")
             return None
     
+    def analyze_stream(self, fileobj, name, file_size=None):
+        """
+        Extract EXIF data from an open binary file object
+        
+        Args:
+            fileobj: Readable binary file object (e.g. a ZIP member)
+            name: Original file name or archive path of the image
+            file_size: Size of the image in bytes, if known
+            
+        Returns:
+            Dictionary with extracted EXIF data or None
+        """
+        try:
+            image = Image.open(fileobj)
+            return self._parse_image(
+                image,
+                filename=Path(name).name,
+                filepath=name,
+                file_size=file_size or 0,
+            )
+            
+        except Exception as e:
+            print(f"Error processing {Path(name).name}: {str(e)}")
+            return None
+    
+    def _parse_header(self, header, filename, filepath, file_size):
+        """
+        Parse EXIF data from the leading bytes of a JPEG
+        
+        Both the fast_parse reader and Pillow only walk the JPEG markers up
+        to the start of scan, so the header is enough whenever all APP
+        segments fit in it. Other formats can keep metadata anywhere in the
+        file and always need a full read.
+        
+        Args:
+            header: First bytes of the image file
+            filename: Image file name
+            filepath: Image path (on disk or inside an archive)
+            file_size: Size of the full image in bytes
+            
+        Returns:
+            Tuple of (parsed, exif_data); parsed is False when a full read is needed
+        """
+        try:
+            if self.fast_parse:
+                try:
+                    fields = read_jpeg_exif(
+                        header, self.BASE_IFD_TAGS + self.EXIF_IFD_TAGS, self.GPS_IFD_TAGS
+                    )
+                except JpegExifError:
+                    fields = None  # leave it to Pillow
+                if fields is not None:
+                    if not fields['has_exif']:
+                        return True, None
+                    return True, self._build_record(
+                        fields['ifd0'], fields['exif'], fields['gps'], fields['size'],
+                        filename, filepath, file_size,
+                    )
+            
+            image = Image.open(io.BytesIO(header))
+            if image.format != 'JPEG':
+                return False, None
+            return True, self._parse_image(image, filename, filepath, file_size)
+        except Exception:
+            return False, None
+    
+    def _parse_image(self, image, filename, filepath, file_size):
+        """
+        Parse EXIF data from an opened PIL image
+        
+        Args:
+            image: Opened PIL image
+            filename: Image file name
+            filepath: Image path (on disk or inside an archive)
+            file_size: Size of the image in bytes
+            
+        Returns:
+            Dictionary with extracted EXIF data or None
+        """
+        exif = image.getexif()
+        
+        if not exif:
+            return None
+        
+        # Sub-IFDs are decoded on demand
+        exif_ifd = exif.get_ifd(IFD.Exif)
+        gps_info = exif.get_ifd(IFD.GPSInfo) if IFD.GPSInfo in exif else None
+        
+        # getexif() also returns plain TIFF tags and XMP orientation, so only
+        # an EXIF block or one of the tags we read makes a photo record
+        if 'exif' not in image.info and not self._has_photo_tags(exif, exif_ifd, gps_info):
+            return None
+        
+        return self._build_record(
+            exif, exif_ifd, gps_info, image.size, filename, filepath, file_size
+        )
+    
+    def _has_photo_tags(self, ifd0, exif_ifd, gps_info):
+        """Check whether any of the tags the dashboard reads are present"""
+        return bool(gps_info) or any(
+            tag in ifd0 or tag in exif_ifd for tag in self.BASE_IFD_TAGS + self.EXIF_IFD_TAGS
+        )
+    
+    def _build_record(self, ifd0, exif_ifd, gps_info, size, filename, filepath, file_size):
+        """
+        Build a photo record from decoded EXIF tags
+        
+        Args:
+            ifd0: Mapping of base IFD tag IDs to values
+            exif_ifd: Mapping of Exif sub-IFD tag IDs to values
+            gps_info: Mapping of GPS IFD tag IDs to values, or None
+            size: Image (width, height)
+            filename: Image file name
+            filepath: Image path (on disk or inside an archive)
+            file_size: Size of the image in bytes
+            
+        Returns:
+            Dictionary with extracted EXIF data
+        """
+        # Look up only the tags we need
+        exif_data = {tag.name: ifd0.get(tag) for tag in self.BASE_IFD_TAGS}
+        exif_data.update({tag.name: exif_ifd.get(tag, ifd0.get(tag)) for tag in self.EXIF_IFD_TAGS})
+        
+        # Initialize parsed data
+        parsed_data = {
+            'filename': filename,
+            'filepath': filepath,
+            'file_size': file_size / (1024 * 1024),  # MB
+        }
+        
+        # Extract key metadata
+        for tag_name, value in exif_data.items():
+            if value is None:
+                continue
+            
+            if tag_name == "Make":
+                parsed_data['camera_make'] = str(value).strip()
+            elif tag_name == "Model":
+                parsed_data['camera_model'] = str(value).strip()
+            elif tag_name == "LensModel":
+                parsed_data['lens'] = str(value).strip()
+            elif tag_name == "FocalLength":
+                parsed_data['focal_length'] = self._parse_rational(value)
+            elif tag_name == "FNumber":
+                parsed_data['aperture'] = self._parse_rational(value)
+            elif tag_name == "ExposureTime":
+                parsed_data['shutter_speed'] = self._parse_shutter_speed(value)
+            elif tag_name == "ISOSpeedRatings":
+                parsed_data['iso'] = int(value)
+            elif tag_name in ["DateTime", "DateTimeOriginal"]:
+                parsed_data['datetime'] = self._parse_datetime(value)
+            elif tag_name == "Flash":
+                parsed_data['flash_used'] = bool(value & 1)
+        
+        if gps_info is not None:
+            gps_data = self._parse_gps(gps_info)
+            if gps_data:
+                parsed_data.update(gps_data)
+        
+        # Add image dimensions and orientation
+        parsed_data['width'], parsed_data['height'] = size
+        parsed_data['orientation'] = 'portrait' if size[1] > size[0] else 'landscape'
+        
+        return parsed_data
+    
     def _parse_rational(self, value):
         """Parse rational number (fraction) from EXIF"""
         try:
@@ -165,4 +522,34 @@ class ExifAnalyzer:
     def _convert_to_degrees(self, value):
         """Convert GPS coordinates to degrees"""
         d, m, s = value
-        return d + (m / 60.0) + (s / 3600.0)
\ No newline at end of file
+        return d + (m / 60.0) + (s / 3600.0)
+
+
+def _extract_one(image_path, fast_read=True, fast_parse=True):
+    """Extract EXIF data from an image file (process pool worker)"""
+    analyzer = ExifAnalyzer(max_workers=1, fast_read=fast_read, fast_parse=fast_parse)
+    return analyzer.extract_exif(Path(image_path))
+
+
+def _rewound(fileobj):
+    """Rewind a caller-owned buffer, yielding it without closing it afterwards"""
+    fileobj.seek(0)
+    return nullcontext(fileobj)
+
+
+def _extract_bytes(name, data, file_size, fast_parse=True):
+    """
+    Extract EXIF data from in-memory image bytes (process pool worker)
+    
+    Returns FULL_READ_NEEDED when data is only a header that could not be
+    parsed on its own; the caller still holds the stream to re-read it.
+    """
+    analyzer = ExifAnalyzer(max_workers=1, fast_parse=fast_parse)
+    truncated = len(data) < file_size
+    if truncated or fast_parse:
+        parsed, exif_data = analyzer._parse_header(data, Path(name).name, name, file_size)
+        if parsed:
+            return exif_data
+        if truncated:
+            return FULL_READ_NEEDED
+    return analyzer.analyze_stream(io.BytesIO(data), name, file_size=file_size)
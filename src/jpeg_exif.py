@@ -0,0 +1,218 @@
+"""
+JPEG EXIF Reader - Minimal JPEG APP1 / TIFF parser for selected tags
+"""
+import struct
+
+
+# Tags pointing at the Exif and GPS sub-IFDs
+EXIF_IFD_POINTER = 0x8769
+GPS_IFD_POINTER = 0x8825
+
+# Start-of-frame markers (everything in 0xC0-0xCF except DHT, JPG and DAC)
+SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# Markers without a length field (restart markers)
+STANDALONE_MARKERS = {0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7}
+
+# TIFF field type -> (struct format, size in bytes)
+FIELD_FORMATS = {
+    1: ('B', 1),   # BYTE
+    3: ('H', 2),   # SHORT
+    4: ('L', 4),   # LONG
+    5: ('L', 8),   # RATIONAL (two LONGs)
+    6: ('b', 1),   # SBYTE
+    8: ('h', 2),   # SSHORT
+    9: ('l', 4),   # SLONG
+    10: ('l', 8),  # SRATIONAL (two SLONGs)
+    11: ('f', 4),  # FLOAT
+    12: ('d', 8),  # DOUBLE
+    13: ('L', 4),  # IFD (an offset, read as a LONG)
+    16: ('Q', 8),  # LONG8
+}
+
+ASCII = 2
+UNDEFINED = 7
+RATIONAL_TYPES = {5, 10}
+
+
+class JpegExifError(ValueError):
+    """Raised when a JPEG is truncated or its EXIF block is malformed"""
+
+
+def read_jpeg_exif(data, tags, gps_tags):
+    """
+    Read selected EXIF tags from the leading bytes of a JPEG
+    
+    Only the JPEG markers up to the start of scan and the requested tags
+    are decoded. Values mirror Pillow's: strings for ASCII, floats for
+    rationals, and tuples when a tag holds more than one value.
+    
+    Args:
+        data: Leading bytes (or all) of the image file
+        tags: Tag IDs to read from the base and Exif IFDs
+        gps_tags: Tag IDs to read from the GPS IFD
+    
+    Returns:
+        None if data is not a JPEG, otherwise a dictionary with:
+        'has_exif' (bool), 'ifd0', 'exif' and 'gps' (tag ID -> value; 'gps'
+        is None without a GPS IFD) and 'size' (width, height)
+    
+    Raises:
+        JpegExifError: If data is truncated or the EXIF block is malformed
+    """
+    if data[:2] != b'\xff\xd8':
+        return None
+    
+    tiff = None
+    size = None
+    pos = 2
+    
+    # Walk the markers up to the start of scan, like Pillow does on open
+    while True:
+        if pos + 2 > len(data):
+            raise JpegExifError("JPEG header is truncated")
+        if data[pos] != 0xFF:
+            raise JpegExifError(f"Expected a JPEG marker at offset {pos}")
+        
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1  # fill byte
+            continue
+        if marker < 0xC0:
+            raise JpegExifError(f"Unknown JPEG marker 0x{marker:02X} at offset {pos}")
+        if marker in STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if marker == 0xD9:
+            raise JpegExifError("JPEG ends before its image data")
+        
+        if pos + 4 > len(data):
+            raise JpegExifError("JPEG header is truncated")
+        length, = struct.unpack_from('>H', data, pos + 2)
+        segment_end = pos + 2 + length
+        if length < 2 or segment_end > len(data):
+            raise JpegExifError("JPEG segment is truncated")
+        if marker == 0xDA:  # start of scan
+            break
+        
+        if marker == 0xE1 and data[pos + 4:pos + 10] == b'Exif\0\0':
+            if tiff is not None:
+                raise JpegExifError("EXIF is split over several APP1 segments")
+            tiff = data[pos + 10:segment_end]
+        elif marker in SOF_MARKERS:
+            if length < 8:
+                raise JpegExifError("SOF segment is too short")
+            precision, height, width, components = struct.unpack_from('>BHHB', data, pos + 4)
+            if precision != 8 or components not in (1, 3, 4):
+                raise JpegExifError("Image layout is not one Pillow can open")
+            size = (width, height)
+        
+        pos = segment_end
+    
+    if size is None:
+        raise JpegExifError("No start-of-frame marker before the image data")
+    
+    result = {'has_exif': False, 'ifd0': {}, 'exif': {}, 'gps': None, 'size': size}
+    if tiff is None:
+        return result
+    
+    byte_order = _read_byte_order(tiff)
+    ifd0_offset, = _unpack(byte_order + 'L', tiff, 4)
+    
+    usable, ifd0 = _read_ifd(tiff, ifd0_offset, byte_order, set(tags) | {EXIF_IFD_POINTER, GPS_IFD_POINTER})
+    result['has_exif'] = usable > 0
+    result['ifd0'] = ifd0
+    
+    if EXIF_IFD_POINTER in ifd0:
+        result['exif'] = _read_ifd(tiff, ifd0[EXIF_IFD_POINTER], byte_order, tags)[1]
+    if GPS_IFD_POINTER in ifd0:
+        result['gps'] = _read_ifd(tiff, ifd0[GPS_IFD_POINTER], byte_order, gps_tags)[1]
+    
+    return result
+
+
+def _read_byte_order(tiff):
+    """Get the struct byte order prefix from a TIFF header"""
+    if tiff[:4] == b'II*\0':
+        return '<'
+    if tiff[:4] == b'MM\0*':
+        return '>'
+    raise JpegExifError("EXIF block has no valid TIFF header")
+
+
+def _unpack(fmt, buffer, offset):
+    """struct.unpack_from that reports out-of-range reads as JpegExifError"""
+    try:
+        return struct.unpack_from(fmt, buffer, offset)
+    except struct.error as e:
+        raise JpegExifError(f"EXIF block is truncated: {e}") from None
+
+
+def _read_ifd(tiff, offset, byte_order, wanted):
+    """
+    Read the wanted tags from one IFD
+    
+    Like Pillow, entries with no values or an unknown type are skipped,
+    though an unknown type on a wanted tag (e.g. a sub-IFD pointer) raises.
+    
+    Returns:
+        Tuple of (number of usable entries in the IFD, dict of tag ID -> value)
+    """
+    if not isinstance(offset, int):
+        raise JpegExifError("IFD pointer is not an offset")
+    
+    entry_count, = _unpack(byte_order + 'H', tiff, offset)
+    usable = 0
+    values = {}
+    
+    for index in range(entry_count):
+        entry = offset + 2 + index * 12
+        tag, field_type, count = _unpack(byte_order + 'HHL', tiff, entry)
+        
+        if field_type == ASCII or field_type == UNDEFINED:
+            item_size = 1
+        elif field_type in FIELD_FORMATS:
+            item_size = FIELD_FORMATS[field_type][1]
+        elif tag in wanted:
+            raise JpegExifError(f"Unknown TIFF field type {field_type} for tag {tag}")
+        else:
+            continue
+        
+        # Values up to four bytes are stored inline, larger ones at an offset
+        length = item_size * count
+        if length <= 4:
+            start = entry + 8
+        else:
+            start, = _unpack(byte_order + 'L', tiff, entry + 8)
+        if not length:
+            continue
+        if start + length > len(tiff):
+            raise JpegExifError(f"Value of tag {tag} runs past the EXIF block")
+        
+        usable += 1
+        if tag in wanted:
+            values[tag] = _decode_value(tiff[start:start + length], field_type, count, byte_order)
+    
+    return usable, values
+
+
+def _decode_value(raw, field_type, count, byte_order):
+    """Decode a raw TIFF field the way Pillow presents it"""
+    if field_type == ASCII:
+        if raw.endswith(b'\0'):
+            raw = raw[:-1]
+        return raw.decode('latin-1', 'replace')
+    if field_type == UNDEFINED:
+        return raw
+    
+    fmt, item_size = FIELD_FORMATS[field_type]
+    if field_type in RATIONAL_TYPES:
+        numbers = struct.unpack(f'{byte_order}{count * 2}{fmt}', raw)
+        items = tuple(
+            numerator / denominator if denominator else float('nan')
+            for numerator, denominator in zip(numbers[::2], numbers[1::2])
+        )
+    else:
+        items = struct.unpack(f'{byte_order}{count}{fmt}', raw)
+    
+    return items[0] if count == 1 else items
@@ -0,0 +1,9 @@
+"""
+Shared test setup - make the analysis modules in src/ importable
+"""
+import sys
+from pathlib import Path
+
+SRC_DIR = str(Path(__file__).parent.parent / 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
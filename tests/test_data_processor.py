@@ -0,0 +1,27 @@
+"""
+Tests for DataProcessor aggregations
+"""
+from datetime import datetime
+
+import pytest
+
+from data_processor import DataProcessor
+
+
+@pytest.fixture
+def processor():
+    dates = [datetime(2023, 12, 30, 9), datetime(2024, 1, 2, 18), datetime(2024, 1, 20, 7), datetime(2024, 3, 5, 12)]
+    return DataProcessor([{'filename': f'{index}.jpg', 'datetime': date} for index, date in enumerate(dates)])
+
+
+@pytest.mark.parametrize('freq, counts', [
+    ('ME', [1, 2, 0, 1]),
+    ('YE', [1, 3]),
+])
+def test_timeline_frequencies(processor, freq, counts):
+    assert list(processor.get_shooting_timeline(freq)['Photos']) == counts
+
+
+def test_default_timeline_is_monthly(processor):
+    assert processor.get_shooting_timeline().equals(processor.get_shooting_timeline('ME'))
+    assert processor.aggregations()['timeline']().equals(processor.get_shooting_timeline('ME'))
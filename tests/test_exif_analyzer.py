@@ -0,0 +1,276 @@
+"""
+Tests for ExifAnalyzer folder, ZIP and in-memory scanning
+"""
+import io
+import os
+import shutil
+import struct
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+import exif_analyzer
+from exif_analyzer import FULL_READ_NEEDED, ExifAnalyzer, _extract_bytes
+
+
+def photo_bytes(model, gps=False, color='blue'):
+    """Encode a small JPEG with camera (and optionally GPS) EXIF tags"""
+    image = Image.new('RGB', (64, 48), color)
+    exif = image.getexif()
+    exif[0x010F] = 'Canon'
+    exif[0x0110] = model
+    if gps:
+        exif.get_ifd(0x8825).update({1: 'N', 2: (43.0, 39.0, 13.0), 3: 'W', 4: (79.0, 23.0, 3.0)})
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+def make_photo(path, model, gps=False, color='blue'):
+    """Save a small JPEG with camera (and optionally GPS) EXIF tags"""
+    path.write_bytes(photo_bytes(model, gps, color))
+
+
+def with_leading_comments(data, total=120_000):
+    """Push a JPEG's EXIF past the fast_read header with COM segments"""
+    comments = b''
+    while len(comments) < total:
+        comments += b'\xff\xfe' + struct.pack('>H', 60_002) + bytes(60_000)
+    return data[:2] + comments + data[2:]
+
+
+def make_zip(members):
+    """Build an in-memory ZIP from (name, bytes or None for a directory) pairs"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in members:
+            if data is None:
+                archive.mkdir(name)
+            else:
+                archive.writestr(name, data)
+    return zipfile.ZipFile(buffer)
+
+
+@pytest.fixture
+def analyzer():
+    """In-process analyzer that walks folders in name order"""
+    analyzer = ExifAnalyzer(max_workers=1)
+    walk = analyzer._iter_images
+    analyzer._iter_images = lambda folder, recursive=True: sorted(walk(folder, recursive))
+    return analyzer
+
+
+def encode(image, format, **params):
+    """Encode an image in memory"""
+    buffer = io.BytesIO()
+    image.save(buffer, format, **params)
+    return buffer.getvalue()
+
+
+def by_name(photos_data):
+    return {record['filename']: record for record in photos_data}
+
+
+def test_distinct_photos_keep_their_own_data(tmp_path, analyzer):
+    make_photo(tmp_path / 'a.jpg', 'R5', gps=True, color='red')
+    make_photo(tmp_path / 'b.jpg', 'R6')
+    
+    photos = by_name(analyzer.scan_folder(tmp_path))
+    
+    assert set(photos) == {'a.jpg', 'b.jpg'}
+    assert photos['a.jpg']['camera_model'] == 'R5'
+    assert photos['a.jpg']['latitude'] == pytest.approx(43.6536, abs=1e-4)
+    assert photos['b.jpg']['camera_model'] == 'R6'
+    assert 'latitude' not in photos['b.jpg']
+
+
+def test_copy_in_a_folder_matches_the_original(tmp_path, analyzer):
+    make_photo(tmp_path / 'a.jpg', 'R5', gps=True)
+    (tmp_path / 'backup').mkdir()
+    shutil.copy(tmp_path / 'a.jpg', tmp_path / 'backup' / 'a_copy.jpg')
+    
+    photos = by_name(analyzer.scan_folder(tmp_path))
+    
+    copy = photos['a_copy.jpg']
+    assert copy['filepath'] == str(tmp_path / 'backup' / 'a_copy.jpg')
+    assert {**copy, 'filename': 'a.jpg', 'filepath': str(tmp_path / 'a.jpg')} == photos['a.jpg']
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason="needs symlinks")
+def test_unreadable_file_does_not_affect_later_photos(tmp_path, analyzer):
+    os.symlink(tmp_path / 'missing.jpg', tmp_path / '0_broken.jpg')
+    make_photo(tmp_path / '1_b.jpg', 'R6')
+    make_photo(tmp_path / '2_a.jpg', 'R5', gps=True, color='red')
+    shutil.copy(tmp_path / '2_a.jpg', tmp_path / '3_a_copy.jpg')
+    
+    photos = by_name(analyzer.scan_folder(tmp_path))
+    
+    assert set(photos) == {'1_b.jpg', '2_a.jpg', '3_a_copy.jpg'}
+    assert photos['3_a_copy.jpg']['camera_model'] == 'R5'
+    assert 'latitude' in photos['3_a_copy.jpg']
+
+
+def test_pool_scan_matches_in_process_scan(tmp_path, analyzer):
+    for index in range(6):
+        make_photo(tmp_path / f'{index}.jpg', f'R{index}', gps=index % 2 == 0, color=(index * 40, 0, 0))
+    shutil.copy(tmp_path / '0.jpg', tmp_path / '0_copy.jpg')
+    
+    in_process = by_name(analyzer.scan_folder(tmp_path))
+    pooled = by_name(ExifAnalyzer(max_workers=2).scan_folder(tmp_path))
+    
+    assert pooled == in_process
+
+
+XMP_ORIENTATION = (
+    b'<x:xmpmeta xmlns:x="adobe:ns:meta/"><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+    b'<rdf:Description xmlns:tiff="http://ns.adobe.com/tiff/1.0/" tiff:Orientation="6"/></rdf:RDF></x:xmpmeta>'
+)
+
+
+def camera_exif():
+    exif = Image.Exif()
+    exif[0x010F] = 'Nikon'
+    exif[0x0110] = 'Z6'
+    return exif
+
+
+@pytest.mark.parametrize('fast_parse', [True, False])
+@pytest.mark.parametrize('name, data, camera_model', [
+    ('plain.tiff', encode(Image.new('RGB', (20, 10)), 'TIFF'), None),
+    ('xmp_only.jpg', encode(Image.new('RGB', (20, 10)), 'JPEG', xmp=XMP_ORIENTATION), None),
+    ('camera.tiff', encode(Image.new('RGB', (20, 10)), 'TIFF', exif=camera_exif()), 'Z6'),
+])
+def test_records_need_exif_or_camera_tags(name, data, camera_model, fast_parse):
+    photos = ExifAnalyzer(max_workers=1, fast_parse=fast_parse).scan_buffers([(name, io.BytesIO(data))])
+    
+    if camera_model is None:
+        assert photos == []
+    else:
+        assert [record['camera_model'] for record in photos] == [camera_model]
+
+
+class RecordingPool(ThreadPoolExecutor):
+    """Stand-in for the process pool that records its size"""
+    sizes = []
+    
+    def __init__(self, max_workers):
+        self.sizes.append(max_workers)
+        super().__init__(max_workers=max_workers)
+
+
+def photo_buffers(count):
+    return [
+        (f'{index}.jpg', io.BytesIO(encode(Image.new('RGB', (16, 16), (index * 80, 0, 0)), 'JPEG', exif=camera_exif())))
+        for index in range(count)
+    ]
+
+
+def test_small_scans_run_in_process(monkeypatch):
+    RecordingPool.sizes = []
+    monkeypatch.setattr(exif_analyzer, 'ProcessPoolExecutor', RecordingPool)
+    
+    photos = ExifAnalyzer(max_workers=8).scan_buffers(photo_buffers(3))
+    
+    assert len(photos) == 3
+    assert RecordingPool.sizes == []
+
+
+def test_pool_is_capped_at_the_job_count(monkeypatch):
+    RecordingPool.sizes = []
+    monkeypatch.setattr(exif_analyzer, 'ProcessPoolExecutor', RecordingPool)
+    monkeypatch.setattr(ExifAnalyzer, 'MIN_POOL_JOBS', 2)
+    
+    photos = ExifAnalyzer(max_workers=8).scan_buffers(photo_buffers(3))
+    
+    assert len(photos) == 3
+    assert RecordingPool.sizes == [3]
+
+
+@pytest.mark.parametrize('name, expected_size', [
+    ('big.jpg', ExifAnalyzer.HEADER_BYTES),
+    ('BIG.JPEG', ExifAnalyzer.HEADER_BYTES),
+    ('big.png', 200_000),
+    ('big.tiff', 200_000),
+])
+def test_only_jpegs_are_cut_to_a_header(name, expected_size):
+    data = ExifAnalyzer(max_workers=1)._read_stream(io.BytesIO(bytes(200_000)), name, 200_000)
+    
+    assert len(data) == expected_size
+
+
+def test_scan_zip_skips_directories_and_macos_forks():
+    archive = make_zip([
+        ('trip/', None),
+        ('trip/a.jpg', photo_bytes('R5', gps=True)),
+        ('trip/day2/b.JPG', photo_bytes('R6', color='red')),
+        ('__MACOSX/trip/._a.jpg', b'\0' * 82),
+        ('__MACOSX/trip/c.jpg', photo_bytes('R7', color='green')),
+        ('trip/._b.jpg', b'\0' * 82),
+        ('trip/notes.txt', b'not a photo'),
+    ])
+    
+    with archive:
+        photos = by_name(ExifAnalyzer(max_workers=1).scan_zip(archive))
+    
+    assert set(photos) == {'a.jpg', 'b.JPG'}
+    assert photos['a.jpg']['filepath'] == 'trip/a.jpg'
+    assert photos['b.JPG']['filepath'] == 'trip/day2/b.JPG'
+    assert photos['a.jpg']['camera_model'] == 'R5'
+    assert 'latitude' in photos['a.jpg']
+
+
+def test_scan_zip_reports_copies_under_their_archive_paths():
+    data = photo_bytes('R5')
+    archive = make_zip([('a.jpg', data), ('backup/a.jpg', data), ('b.jpg', photo_bytes('R6', color='red'))])
+    
+    with archive:
+        photos = ExifAnalyzer(max_workers=1).scan_zip(archive)
+    
+    assert sorted(record['filepath'] for record in photos) == ['a.jpg', 'b.jpg', 'backup/a.jpg']
+    assert [record['camera_model'] for record in photos if record['filename'] == 'a.jpg'] == ['R5', 'R5']
+
+
+def test_exif_past_the_header_is_read_in_full(tmp_path):
+    data = with_leading_comments(photo_bytes('R5', gps=True))
+    header = data[:ExifAnalyzer.HEADER_BYTES]
+    assert _extract_bytes('late.jpg', header, len(data)) == FULL_READ_NEEDED
+    
+    (tmp_path / 'late.jpg').write_bytes(data)
+    analyzer = ExifAnalyzer(max_workers=1)
+    with make_zip([('late.jpg', data)]) as archive:
+        scans = {
+            'zip': analyzer.scan_zip(archive),
+            'buffers': analyzer.scan_buffers([('late.jpg', io.BytesIO(data))]),
+            'folder': analyzer.scan_folder(tmp_path),
+        }
+    
+    for photos in scans.values():
+        assert [record['camera_model'] for record in photos] == ['R5']
+        assert 'latitude' in photos[0]
+
+
+def test_large_png_in_zip():
+    image = Image.frombytes('RGB', (200, 200), os.urandom(120_000))
+    data = encode(image, 'PNG', exif=camera_exif())
+    assert len(data) > ExifAnalyzer.HEADER_BYTES
+    
+    with make_zip([('scan.png', data)]) as archive:
+        photos = ExifAnalyzer(max_workers=1).scan_zip(archive)
+    
+    assert [(record['camera_model'], record['width']) for record in photos] == [('Z6', 200)]
+
+
+def test_scan_buffers_rewinds_and_leaves_buffers_open():
+    buffers = [('a.jpg', io.BytesIO(photo_bytes('R5'))), ('b.jpg', io.BytesIO(photo_bytes('R6', color='red')))]
+    for _, buffer in buffers:
+        buffer.seek(0, io.SEEK_END)  # e.g. already read by the caller
+    analyzer = ExifAnalyzer(max_workers=1)
+    
+    first = analyzer.scan_buffers(buffers)
+    second = analyzer.scan_buffers(buffers)
+    
+    assert sorted(record['camera_model'] for record in first) == ['R5', 'R6']
+    assert second == first
+    assert not any(buffer.closed for _, buffer in buffers)
@@ -0,0 +1,198 @@
+"""
+Tests for the fast JPEG EXIF reader, checked against Pillow
+"""
+import io
+import struct
+
+import pytest
+from PIL import Image, TiffImagePlugin
+from PIL.ExifTags import IFD
+
+from exif_analyzer import ExifAnalyzer
+from jpeg_exif import JpegExifError, read_jpeg_exif
+
+TAGS = ExifAnalyzer.BASE_IFD_TAGS + ExifAnalyzer.EXIF_IFD_TAGS
+GPS_TAGS = ExifAnalyzer.GPS_IFD_TAGS
+
+
+def make_exif(endian='<', gps=True):
+    """Camera EXIF with short (inline) and long (offset) values"""
+    exif = Image.Exif()
+    exif.endian = endian
+    exif[0x010F] = 'Canon'                # Make: 6 bytes, stored at an offset
+    exif[0x0110] = 'R6'                   # Model: 3 bytes, stored inline
+    exif[0x0132] = '2024:05:01 10:30:00'  # DateTime
+    exif_ifd = exif.get_ifd(IFD.Exif)
+    exif_ifd.update({
+        0x8827: 400,                      # ISOSpeedRatings: SHORT, inline
+        0x829D: 2.8,                      # FNumber: RATIONAL, at an offset
+        0x829A: 0.004,                    # ExposureTime
+        0x920A: 50.0,                     # FocalLength
+        0x9209: 1,                        # Flash
+        0xA434: 'EF50',                   # LensModel: 5 bytes, at an offset
+    })
+    if gps:
+        exif.get_ifd(IFD.GPSInfo).update({1: 'S', 2: (33.0, 51.0, 54.0), 3: 'E', 4: (151.0, 12.0, 36.0)})
+    return exif
+
+
+def make_jpeg(exif=None, size=(64, 48)):
+    """Encode a small JPEG, optionally with EXIF"""
+    buffer = io.BytesIO()
+    kwargs = {'exif': exif} if exif is not None else {}
+    Image.new('RGB', size, 'green').save(buffer, 'JPEG', **kwargs)
+    return buffer.getvalue()
+
+
+def parse_both(data):
+    """Parse a JPEG header with the fast reader and with Pillow"""
+    def parse(fast_parse):
+        analyzer = ExifAnalyzer(max_workers=1, fast_parse=fast_parse)
+        return analyzer._parse_header(data, 'photo.jpg', 'photo.jpg', len(data))
+    return parse(True), parse(False)
+
+
+def plain(value):
+    """Pillow's IFDRational as a float, recursively, for comparisons"""
+    if isinstance(value, tuple):
+        return tuple(plain(item) for item in value)
+    if isinstance(value, TiffImagePlugin.IFDRational):
+        return float(value)
+    return value
+
+
+def set_entry_type(data, tag, field_type):
+    """Rewrite the field type of a base IFD entry inside a JPEG's EXIF"""
+    data = bytearray(data)
+    tiff = data.index(b'Exif\0\0') + 6
+    byte_order = '<' if data[tiff:tiff + 2] == b'II' else '>'
+    offset, = struct.unpack_from(byte_order + 'L', data, tiff + 4)
+    entry_count, = struct.unpack_from(byte_order + 'H', data, tiff + offset)
+    for index in range(entry_count):
+        entry = tiff + offset + 2 + index * 12
+        if struct.unpack_from(byte_order + 'H', data, entry)[0] == tag:
+            struct.pack_into(byte_order + 'H', data, entry + 2, field_type)
+            return bytes(data)
+    raise KeyError(tag)
+
+
+@pytest.mark.parametrize('endian', ['<', '>'])
+def test_values_match_pillow(endian):
+    data = make_jpeg(make_exif(endian))
+    assert data[data.index(b'Exif\0\0') + 6:][:2] == (b'II' if endian == '<' else b'MM')
+    
+    fields = read_jpeg_exif(data, TAGS, GPS_TAGS)
+    exif = Image.open(io.BytesIO(data)).getexif()
+    
+    assert fields['has_exif']
+    assert fields['size'] == (64, 48)
+    for tag in TAGS:
+        if tag in exif:
+            assert fields['ifd0'][tag] == plain(exif[tag])
+    for tag, value in exif.get_ifd(IFD.Exif).items():
+        assert fields['exif'][tag] == plain(value)
+    assert fields['gps'] == {tag: plain(value) for tag, value in exif.get_ifd(IFD.GPSInfo).items()}
+
+
+@pytest.mark.parametrize('endian', ['<', '>'])
+def test_records_match_pillow_path(endian):
+    data = make_jpeg(make_exif(endian))
+    analyzer = ExifAnalyzer(max_workers=1)
+    
+    fields = read_jpeg_exif(data, TAGS, GPS_TAGS)
+    fast = analyzer._build_record(
+        fields['ifd0'], fields['exif'], fields['gps'], fields['size'], 'photo.jpg', 'photo.jpg', len(data)
+    )
+    pillow = analyzer._parse_image(Image.open(io.BytesIO(data)), 'photo.jpg', 'photo.jpg', len(data))
+    
+    assert fast == pillow
+    assert fast['camera_make'] == 'Canon'
+    assert fast['camera_model'] == 'R6'
+    assert fast['lens'] == 'EF50'
+    assert fast['iso'] == 400
+    assert fast['aperture'] == 2.8
+    assert fast['latitude'] == pytest.approx(-33.865)
+    assert fast['longitude'] == pytest.approx(151.21)
+    assert parse_both(data) == ((True, fast), (True, fast))
+
+
+def test_inline_and_offset_values():
+    exif = make_exif(gps=False)
+    exif.get_ifd(IFD.Exif)[0x8827] = (100, 200)  # two SHORTs still fit inline
+    exif[0x0110] = 'EOS'                         # exactly four bytes with its NUL
+    data = make_jpeg(exif)
+    
+    fields = read_jpeg_exif(data, TAGS, GPS_TAGS)
+    pillow = Image.open(io.BytesIO(data)).getexif()
+    
+    assert fields['exif'][0x8827] == (100, 200) == pillow.get_ifd(IFD.Exif)[0x8827]
+    assert fields['ifd0'][0x0110] == 'EOS' == pillow[0x0110]
+    assert fields['ifd0'][0x010F] == 'Canon'
+    assert fields['gps'] is None
+    
+    fast, pillow_record = parse_both(data)
+    assert fast == pillow_record
+
+
+def test_truncated_header_raises_and_falls_back():
+    data = make_jpeg(make_exif())
+    app1 = data.index(b'Exif\0\0')
+    end_of_header = data.index(b'\xff\xda') + 4
+    
+    for cut in (3, app1 - 2, app1 + 40, end_of_header):
+        header = data[:cut]
+        with pytest.raises(JpegExifError):
+            read_jpeg_exif(header, TAGS, GPS_TAGS)
+        assert parse_both(header) == ((False, None), (False, None))
+
+
+def test_exif_split_over_several_app1_segments():
+    data = make_jpeg(make_exif())
+    app1 = data.index(b'Exif\0\0') - 4
+    length, = struct.unpack_from('>H', data, app1 + 2)
+    segment = data[app1:app1 + 2 + length]
+    doubled = data[:app1 + 2 + length] + segment + data[app1 + 2 + length:]
+    
+    with pytest.raises(JpegExifError):
+        read_jpeg_exif(doubled, TAGS, GPS_TAGS)
+    
+    fast, pillow = parse_both(doubled)
+    assert fast == pillow
+    assert fast[1]['camera_model'] == 'R6'
+
+
+def test_no_app1_segment():
+    data = make_jpeg(size=(30, 40))
+    
+    assert read_jpeg_exif(data, TAGS, GPS_TAGS) == {
+        'has_exif': False, 'ifd0': {}, 'exif': {}, 'gps': None, 'size': (30, 40),
+    }
+    assert parse_both(data) == ((True, None), (True, None))
+
+
+def test_ifd_typed_exif_pointer():
+    data = set_entry_type(make_jpeg(make_exif()), 0x8769, 13)
+    
+    fields = read_jpeg_exif(data, TAGS, GPS_TAGS)
+    assert fields['exif'][0x8827] == 400
+    
+    fast, pillow = parse_both(data)
+    assert fast == pillow
+    assert (fast[1]['iso'], fast[1]['lens'], fast[1]['aperture']) == (400, 'EF50', 2.8)
+
+
+def test_unknown_pointer_type_defers_to_pillow():
+    data = set_entry_type(make_jpeg(make_exif()), 0x8769, 99)
+    
+    with pytest.raises(JpegExifError):
+        read_jpeg_exif(data, TAGS, GPS_TAGS)
+    
+    fast, pillow = parse_both(data)
+    assert fast == pillow
+
+
+def test_non_jpeg_is_not_parsed():
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8)).save(buffer, 'PNG')
+    
+    assert read_jpeg_exif(buffer.getvalue(), TAGS, GPS_TAGS) is None
@@ -3,19 +3,15 @@ EXIF Dashboard Pro - Streamlit Web Application
 """
 import streamlit as st
 import sys
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import tempfile
 import zipfile
-import plotly.express as px
-import plotly.graph_objects as go
-import folium
-from streamlit_folium import folium_static
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
-
-from exif_analyzer import ExifAnalyzer
-from data_processor import DataProcessor
 
+# Analysis modules live in src/ (added to the path at startup). They, and the
+# plotting and mapping libraries, are imported where they are used so the
+# welcome screen renders without importing pandas or Pillow
+SRC_DIR = str(Path(__file__).parent.parent / 'src')
 
 # Page configuration
 st.set_page_config(
@@ -35,21 +31,6 @@ st.markdown("""
         color: #1f77b4;
         margin-bottom: 1rem;
     }
-    .stat-box {
-        background-color: #f0f2f6;
-        padding: 20px;
-        border-radius: 10px;
-        text-align: center;
-    }
-    .stat-value {
-        font-size: 2rem;
-        font-weight: bold;
-        color: #1f77b4;
-    }
-    .stat-label {
-        font-size: 1rem;
-        color: #666;
-    }
     </style>
 """, unsafe_allow_html=True)
 
@@ -89,8 +70,8 @@ def main():
         show_gps = st.checkbox("Show GPS Map", value=True)
         timeline_freq = st.selectbox(
             "Timeline frequency", 
-            ['D', 'W', 'M', 'Y'], 
-            format_func=lambda x: {'D': 'Daily', 'W': 'Weekly', 'M': 'Monthly', 'Y': 'Yearly'}[x],
+            ['D', 'W', 'ME', 'YE'], 
+            format_func=lambda x: {'D': 'Daily', 'W': 'Weekly', 'ME': 'Monthly', 'YE': 'Yearly'}[x],
             index=2
         )
         
@@ -142,112 +123,183 @@ def show_welcome_screen():
 
 def process_zip_upload(uploaded_file, show_gps, timeline_freq):
     """Process uploaded ZIP file with nested folder support"""
-    with st.spinner("📦 Extracting ZIP and scanning all folders (including nested ones)..."):
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Extract ZIP
-            zip_path = temp_path / "photos.zip"
-            with open(zip_path, 'wb') as f:
-                f.write(uploaded_file.getbuffer())
-            
-            extract_path = temp_path / "extracted"
-            extract_path.mkdir()
-            
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_path)
-            
-            st.info("🔍 Scanning all folders recursively for photos...")
-            
-            # Analyze photos (recursive=True scans all nested folders)
-            analyzer = ExifAnalyzer()
-            photos_data = analyzer.scan_folder(str(extract_path), recursive=True)
-            
-            if not photos_data:
-                st.error("❌ No valid photos with EXIF data found in the ZIP file (checked all nested folders).")
-                st.info("💡 Make sure your photos are JPG, PNG, or TIFF with EXIF metadata intact.")
-                return
-            
-            st.success(f"✅ Found {len(photos_data)} photos across all folders!")
-            
-            # Process and display results
-            display_dashboard(photos_data, show_gps, timeline_freq)
+    upload_key = upload_digest(uploaded_file)
+    
+    with st.spinner("📦 Reading ZIP and scanning all folders (including nested ones)..."):
+        st.info("🔍 Scanning all folders recursively for photos...")
+        
+        # Analyze photos straight from the archive (nested folders included)
+        photos_df = scan_zip_upload(upload_key, uploaded_file)
+        
+        if photos_df.empty:
+            st.error("❌ No valid photos with EXIF data found in the ZIP file (checked all nested folders).")
+            st.info("💡 Make sure your photos are JPG, PNG, or TIFF with EXIF metadata intact.")
+            return
+        
+        st.success(f"✅ Found {len(photos_df)} photos across all folders!")
+    
+    # Process and display results
+    display_dashboard(photos_df, show_gps, timeline_freq, upload_key)
 
 
 def process_individual_uploads(uploaded_files, show_gps, timeline_freq):
     """Process individually uploaded photos"""
+    upload_key = upload_digest(*uploaded_files)
+    
     with st.spinner(f"Analyzing {len(uploaded_files)} photos..."):
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Save uploaded files
-            for uploaded_file in uploaded_files:
-                file_path = temp_path / uploaded_file.name
-                with open(file_path, 'wb') as f:
-                    f.write(uploaded_file.getbuffer())
-            
-            # Analyze photos
-            analyzer = ExifAnalyzer()
-            photos_data = analyzer.scan_folder(str(temp_path), recursive=False)
-            
-            if not photos_data:
-                st.error("No valid photos with EXIF data found.")
-                return
-            
-            # Process and display results
-            display_dashboard(photos_data, show_gps, timeline_freq)
+        photos_df = scan_individual_uploads(upload_key, uploaded_files)
+        
+        if photos_df.empty:
+            st.error("No valid photos with EXIF data found.")
+            return
+    
+    # Process and display results
+    display_dashboard(photos_df, show_gps, timeline_freq, upload_key)
+
 
+def upload_digest(*uploaded_files):
+    """Fingerprint uploaded files so cached results survive reruns"""
+    digest = hashlib.blake2b(digest_size=16)
+    for uploaded_file in uploaded_files:
+        digest.update(uploaded_file.name.encode())
+        digest.update(uploaded_file.getbuffer())
+    return digest.hexdigest()
 
-def display_dashboard(photos_data, show_gps, timeline_freq):
-    """Display comprehensive analysis dashboard"""
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def scan_zip_upload(upload_key, _uploaded_file):
+    """Scan an uploaded ZIP file (cached by upload fingerprint)"""
+    from data_processor import build_frame
+    from exif_analyzer import ExifAnalyzer
+    
+    analyzer = ExifAnalyzer()
+    progress_bar = st.progress(0.0, text="Extracting EXIF data...")
+    with zipfile.ZipFile(_uploaded_file, 'r') as zip_ref:
+        photos_data = analyzer.scan_zip(zip_ref, progress_callback=make_progress_callback(progress_bar))
+    progress_bar.empty()
+    return build_frame(photos_data)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def scan_individual_uploads(upload_key, _uploaded_files):
+    """Scan individually uploaded photos (cached by upload fingerprint)"""
+    from data_processor import build_frame
+    from exif_analyzer import ExifAnalyzer
+    
+    # Analyze photos straight from the upload buffers
+    analyzer = ExifAnalyzer()
+    progress_bar = st.progress(0.0, text="Extracting EXIF data...")
+    photos_data = analyzer.scan_buffers(
+        ((uploaded_file.name, uploaded_file) for uploaded_file in _uploaded_files),
+        progress_callback=make_progress_callback(progress_bar)
+    )
+    progress_bar.empty()
+    return build_frame(photos_data)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_processor(upload_key, _photos_df):
+    """Build the DataProcessor once per upload"""
+    from data_processor import DataProcessor
     
-    # Create data processor
-    processor = DataProcessor(photos_data)
+    return DataProcessor(_photos_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def stats_store(upload_key):
+    """Per-upload store of finished aggregations, shared across reruns"""
+    return {}
+
+
+@st.cache_resource(show_spinner=False)
+def chart_template():
+    """Register the shared Plotly template once per process and make it the default"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    
+    pio.templates['exif'] = go.layout.Template(layout=dict(
+        colorway=px.colors.qualitative.D3,
+        hovermode='x unified',
+        margin=dict(l=40, r=20, t=40, b=40),
+    ))
+    pio.templates.default = 'plotly+exif'
+    return 'exif'
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def pie_chart(data, values, names, title):
+    """Build a donut chart (cached by the aggregated data it plots)"""
+    import plotly.express as px
     
-    # Get summary report
-    summary = processor.get_summary_report()
+    chart_template()
+    return px.pie(data, values=values, names=names, title=title, hole=0.3)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def bar_chart(data, x, y, title, labels, color):
+    """Build a single-color bar chart (cached by the aggregated data it plots)"""
+    import plotly.express as px
     
-    # Display summary statistics
+    chart_template()
+    return px.bar(data, x=x, y=y, title=title, labels=labels, color_discrete_sequence=[color])
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def timeline_chart(data):
+    """Build the shooting timeline chart (cached by the aggregated data it plots)"""
+    import plotly.express as px
+    
+    chart_template()
+    return px.line(
+        data, 
+        x='Date', 
+        y='Photos', 
+        title='Photos Over Time',
+        labels={'Photos': 'Number of Photos'},
+        markers=True
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def split_chart(labels, values, title):
+    """Build a donut chart from raw labels and values (cached by its inputs)"""
+    import plotly.graph_objects as go
+    
+    chart_template()
+    return go.Figure(data=[go.Pie(labels=labels, values=values, hole=0.3)], layout=dict(title=title))
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def arrow_table(data):
+    """Convert an aggregated DataFrame to Arrow once for st.dataframe"""
+    import pyarrow as pa
+    
+    return pa.Table.from_pandas(data, preserve_index=False)
+
+
+def make_progress_callback(progress_bar):
+    """Build an analyzer progress callback that updates a Streamlit progress bar"""
+    def update(done, total):
+        progress_bar.progress(done / total, text=f"Extracting EXIF data... {done}/{total}")
+    return update
+
+
+def render_summary_stats(summary):
+    """Display headline collection statistics"""
     st.markdown("---")
     st.markdown("## 📊 Summary Statistics")
     
     col1, col2, col3, col4 = st.columns(4)
     
-    with col1:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="stat-value">{summary['total_photos']}</div>
-            <div class="stat-label">Total Photos</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="stat-value">{summary['unique_cameras']}</div>
-            <div class="stat-label">Cameras Used</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="stat-value">{summary['unique_lenses']}</div>
-            <div class="stat-label">Lenses Used</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="stat-value">{summary['photos_with_gps']}</div>
-            <div class="stat-label">Photos with GPS</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Camera and Lens Usage
+    col1.metric("Total Photos", summary['total_photos'])
+    col2.metric("Cameras Used", summary['unique_cameras'])
+    col3.metric("Lenses Used", summary['unique_lenses'])
+    col4.metric("Photos with GPS", summary['photos_with_gps'])
+
+
+def render_gear_usage(camera_df, lens_df):
+    """Display camera and lens usage charts"""
     st.markdown("---")
     st.markdown("## 📷 Camera & Lens Usage")
     
@@ -255,41 +307,29 @@ def display_dashboard(photos_data, show_gps, timeline_freq):
     
     with col1:
         st.markdown("### Camera Distribution")
-        camera_df = processor.get_camera_usage()
         if not camera_df.empty:
-            fig = px.pie(
-                camera_df, 
-                values='Photos', 
-                names='Camera', 
-                title='Camera Usage',
-                hole=0.3
-            )
+            fig = pie_chart(camera_df, 'Photos', 'Camera', 'Camera Usage')
             st.plotly_chart(fig, use_container_width=True)
             
             # Show table
-            st.dataframe(camera_df, use_container_width=True, hide_index=True)
+            st.dataframe(arrow_table(camera_df), use_container_width=True, hide_index=True)
         else:
             st.info("No camera data available")
     
     with col2:
         st.markdown("### Lens Distribution")
-        lens_df = processor.get_lens_usage()
         if not lens_df.empty:
-            fig = px.pie(
-                lens_df, 
-                values='Photos', 
-                names='Lens',
-                title='Lens Usage',
-                hole=0.3
-            )
+            fig = pie_chart(lens_df, 'Photos', 'Lens', 'Lens Usage')
             st.plotly_chart(fig, use_container_width=True)
             
             # Show table
-            st.dataframe(lens_df, use_container_width=True, hide_index=True)
+            st.dataframe(arrow_table(lens_df), use_container_width=True, hide_index=True)
         else:
             st.info("No lens data available")
-    
-    # Settings Analysis
+
+
+def render_settings_analysis(iso_df, aperture_df, fl_df):
+    """Display ISO, aperture and focal length distributions"""
     st.markdown("---")
     st.markdown("## ⚙️ Camera Settings Analysis")
     
@@ -297,72 +337,64 @@ def display_dashboard(photos_data, show_gps, timeline_freq):
     
     with col1:
         st.markdown("### ISO Distribution")
-        iso_df = processor.get_iso_distribution()
         if not iso_df.empty:
-            fig = px.bar(
+            fig = bar_chart(
                 iso_df, 
                 x='ISO', 
                 y='Count', 
                 title='ISO Usage',
-                labels={'Count': 'Number of Photos'}
+                labels={'Count': 'Number of Photos'},
+                color='#1f77b4'
             )
-            fig.update_traces(marker_color='#1f77b4')
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No ISO data available")
     
     with col2:
         st.markdown("### Aperture Distribution")
-        aperture_df = processor.get_aperture_distribution()
         if not aperture_df.empty:
-            fig = px.bar(
+            fig = bar_chart(
                 aperture_df, 
                 x='Aperture', 
                 y='Count', 
                 title='Aperture Usage',
-                labels={'Count': 'Number of Photos', 'Aperture': 'f-stop'}
+                labels={'Count': 'Number of Photos', 'Aperture': 'f-stop'},
+                color='#ff7f0e'
             )
-            fig.update_traces(marker_color='#ff7f0e')
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No aperture data available")
     
     with col3:
         st.markdown("### Focal Length Distribution")
-        fl_df = processor.get_focal_length_distribution()
         if not fl_df.empty:
-            fig = px.bar(
+            fig = bar_chart(
                 fl_df, 
                 x='Focal Length (mm)', 
                 y='Count', 
                 title='Focal Length Usage',
-                labels={'Count': 'Number of Photos'}
+                labels={'Count': 'Number of Photos'},
+                color='#2ca02c'
             )
-            fig.update_traces(marker_color='#2ca02c')
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No focal length data available")
-    
-    # Timeline Analysis
+
+
+def render_timeline(timeline_df):
+    """Display the shooting timeline"""
     st.markdown("---")
     st.markdown("## 📅 Shooting Timeline")
     
-    timeline_df = processor.get_shooting_timeline(freq=timeline_freq)
     if not timeline_df.empty:
-        fig = px.line(
-            timeline_df, 
-            x='Date', 
-            y='Photos', 
-            title='Photos Over Time',
-            labels={'Photos': 'Number of Photos'}
-        )
-        fig.update_traces(mode='lines+markers', line_color='#1f77b4')
-        fig.update_layout(hovermode='x unified')
+        fig = timeline_chart(timeline_df)
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No date data available for timeline")
-    
-    # Time of Day Analysis
+
+
+def render_shooting_patterns(tod_df, dow_df):
+    """Display time of day and day of week patterns"""
     st.markdown("---")
     st.markdown("## 🌅 Shooting Patterns")
     
@@ -370,68 +402,75 @@ def display_dashboard(photos_data, show_gps, timeline_freq):
     
     with col1:
         st.markdown("### Time of Day Distribution")
-        tod_df = processor.get_time_of_day_distribution()
         if not tod_df.empty:
-            fig = px.bar(
+            fig = bar_chart(
                 tod_df, 
                 x='Time of Day', 
                 y='Photos',
                 title='Photos by Time of Day',
-                labels={'Photos': 'Number of Photos'}
+                labels={'Photos': 'Number of Photos'},
+                color='#ff7f0e'
             )
-            fig.update_traces(marker_color='#ff7f0e')
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No time data available")
     
     with col2:
         st.markdown("### Day of Week Distribution")
-        dow_df = processor.get_day_of_week_distribution()
         if not dow_df.empty:
-            fig = px.bar(
+            fig = bar_chart(
                 dow_df, 
                 x='Day', 
                 y='Photos',
                 title='Photos by Day of Week',
-                labels={'Photos': 'Number of Photos'}
+                labels={'Photos': 'Number of Photos'},
+                color='#2ca02c'
             )
-            fig.update_traces(marker_color='#2ca02c')
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No day data available")
+
+
+def render_gps_map(gps_df):
+    """Display photo locations on a map"""
+    st.markdown("---")
+    st.markdown("## 🗺️ Photo Locations")
     
-    # GPS Map
-    if show_gps:
-        st.markdown("---")
-        st.markdown("## 🗺️ Photo Locations")
+    if not gps_df.empty:
+        import pydeck as pdk
         
-        gps_df = processor.get_gps_photos()
-        if not gps_df.empty:
-            # Create map centered on average location
-            center_lat = gps_df['latitude'].mean()
-            center_lon = gps_df['longitude'].mean()
-            
-            m = folium.Map(location=[center_lat, center_lon], zoom_start=10)
-            
-            # Add markers for each photo
-            for idx, row in gps_df.iterrows():
-                folium.CircleMarker(
-                    location=[row['latitude'], row['longitude']],
-                    radius=5,
-                    popup=row['filename'],
-                    color='blue',
-                    fill=True,
-                    fillColor='blue',
-                    fillOpacity=0.6
-                ).add_to(m)
-            
-            # Display map
-            folium_static(m, width=1200, height=500)
-            st.info(f"Showing {len(gps_df)} photos with GPS coordinates")
-        else:
-            st.info("No GPS data available in photos")
-    
-    # Additional Statistics
+        # Create map centered on average location
+        center_lat, center_lon = gps_df[['latitude', 'longitude']].to_numpy().mean(axis=0)
+        view = pdk.ViewState(latitude=center_lat, longitude=center_lon, zoom=10)
+        
+        # Draw all photos as one WebGL scatter layer
+        layer = pdk.Layer(
+            'ScatterplotLayer',
+            data=gps_df[['longitude', 'latitude', 'filename']],
+            get_position='[longitude, latitude]',
+            get_radius=50,
+            radius_min_pixels=4,
+            get_fill_color=[31, 119, 180, 160],
+            pickable=True
+        )
+        
+        # Display map
+        st.pydeck_chart(
+            pdk.Deck(
+                layers=[layer],
+                initial_view_state=view,
+                map_style='light',
+                tooltip={'text': '{filename}'}
+            ),
+            height=500
+        )
+        st.info(f"Showing {len(gps_df)} photos with GPS coordinates")
+    else:
+        st.info("No GPS data available in photos")
+
+
+def render_additional_stats(orientation_stats, flash_stats):
+    """Display orientation and flash usage charts"""
     st.markdown("---")
     st.markdown("## 📈 Additional Statistics")
     
@@ -439,52 +478,123 @@ def display_dashboard(photos_data, show_gps, timeline_freq):
     
     with col1:
         st.markdown("### Photo Orientation")
-        orientation_stats = processor.get_orientation_stats()
         if orientation_stats:
-            fig = go.Figure(data=[go.Pie(
-                labels=['Portrait', 'Landscape'],
-                values=[orientation_stats.get('portrait', 0), orientation_stats.get('landscape', 0)],
-                hole=0.3
-            )])
-            fig.update_layout(title='Portrait vs Landscape')
+            fig = split_chart(
+                ['Portrait', 'Landscape'],
+                [orientation_stats.get('portrait', 0), orientation_stats.get('landscape', 0)],
+                'Portrait vs Landscape'
+            )
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.markdown("### Flash Usage")
-        flash_stats = processor.get_flash_usage_stats()
         if flash_stats:
-            fig = go.Figure(data=[go.Pie(
-                labels=['Flash Used', 'No Flash'],
-                values=[flash_stats.get('used', 0), flash_stats.get('not_used', 0)],
-                hole=0.3
-            )])
-            fig.update_layout(title='Flash Usage')
+            fig = split_chart(
+                ['Flash Used', 'No Flash'],
+                [flash_stats.get('used', 0), flash_stats.get('not_used', 0)],
+                'Flash Usage'
+            )
             st.plotly_chart(fig, use_container_width=True)
+
+
+def render_collection_summary(summary):
+    """Display date, ISO and aperture ranges for the collection"""
+    if 'date_range' not in summary:
+        return
     
-    # Show detailed summary at the end
-    if 'date_range' in summary:
-        st.markdown("---")
-        st.markdown("## 📋 Collection Summary")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Date Range", f"{summary['date_range']['span_days']} days")
-            st.caption(f"From {summary['date_range']['earliest'].strftime('%Y-%m-%d')} to {summary['date_range']['latest'].strftime('%Y-%m-%d')}")
-        
-        with col2:
-            if 'iso_stats' in summary:
-                st.metric("ISO Range", f"{summary['iso_stats']['min']} - {summary['iso_stats']['max']}")
-                st.caption(f"Average: {summary['iso_stats']['mean']}")
-        
-        with col3:
-            if 'aperture_stats' in summary:
-                st.metric("Aperture Range", f"f/{summary['aperture_stats']['min']} - f/{summary['aperture_stats']['max']}")
-                if summary['aperture_stats']['most_common']:
-                    st.caption(f"Most used: f/{summary['aperture_stats']['most_common']}")
+    st.markdown("---")
+    st.markdown("## 📋 Collection Summary")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Date Range", f"{summary['date_range']['span_days']} days")
+        st.caption(f"From {summary['date_range']['earliest'].strftime('%Y-%m-%d')} to {summary['date_range']['latest'].strftime('%Y-%m-%d')}")
+    
+    with col2:
+        if 'iso_stats' in summary:
+            st.metric("ISO Range", f"{summary['iso_stats']['min']} - {summary['iso_stats']['max']}")
+            st.caption(f"Average: {summary['iso_stats']['mean']}")
+    
+    with col3:
+        if 'aperture_stats' in summary:
+            st.metric("Aperture Range", f"f/{summary['aperture_stats']['min']} - f/{summary['aperture_stats']['max']}")
+            if summary['aperture_stats']['most_common']:
+                st.caption(f"Most used: f/{summary['aperture_stats']['most_common']}")
+
+
+# Dashboard sections in page order, with the aggregations each one renders
+DASHBOARD_SECTIONS = [
+    (render_summary_stats, ('summary',)),
+    (render_gear_usage, ('camera', 'lens')),
+    (render_settings_analysis, ('iso', 'aperture', 'focal_length')),
+    (render_timeline, ('timeline',)),
+    (render_shooting_patterns, ('time_of_day', 'day_of_week')),
+    (render_gps_map, ('gps',)),
+    (render_additional_stats, ('orientation', 'flash')),
+    (render_collection_summary, ('summary',)),
+]
+
+
+def display_dashboard(photos_df, show_gps, timeline_freq, upload_key):
+    """
+    Display comprehensive analysis dashboard
+    
+    Sections are drawn into placeholders as soon as the aggregations they
+    need are ready, so cheap ones show up while heavier ones still compute.
+    A failing aggregation only replaces its own sections with an error.
+    """
+    processor = load_processor(upload_key, photos_df)
+    aggregations = processor.aggregations(freq=timeline_freq)
+    computed = stats_store(upload_key)
+    
+    sections = [
+        (renderer, names) for renderer, names in DASHBOARD_SECTIONS
+        if show_gps or renderer is not render_gps_map
+    ]
+    
+    def store_key(name):
+        # The timeline is the only aggregation that depends on a widget
+        return (name, timeline_freq) if name == 'timeline' else name
+    
+    # Reserve a slot per section so they keep page order while filling in
+    placeholders = [st.empty() for _ in sections]
+    waiting = list(range(len(sections)))
+    failed = {}
+    
+    def render_ready():
+        for index in list(waiting):
+            renderer, names = sections[index]
+            errors = [failed[name] for name in names if name in failed]
+            if errors:
+                with placeholders[index].container():
+                    st.error(f"Could not compute this section: {errors[0]}")
+                waiting.remove(index)
+            elif all(store_key(name) in computed for name in names):
+                with placeholders[index].container():
+                    renderer(*(computed[store_key(name)] for name in names))
+                waiting.remove(index)
+    
+    render_ready()
+    
+    # Compute whatever is missing in background threads (no Streamlit calls there)
+    missing = {name for _, names in sections for name in names if store_key(name) not in computed}
+    if missing:
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            futures = {executor.submit(aggregations[name]): name for name in missing}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    computed[store_key(name)] = future.result()
+                except Exception as e:
+                    failed[name] = e
+                render_ready()
 
 
 if __name__ == "__main__":
+    # Streamlit re-executes this script on every rerun; add src only once
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
     main()
 
 # Made with ❤️ in Toronto, Canada 🇨🇦 by Alexander Wondwossen (@thealxlabs)